@@ -1,16 +1,30 @@
 from __future__ import annotations
+from collections import defaultdict
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Generic, List, Callable, Type, Dict, TypeVar, Iterable, Any, FrozenSet, Set, cast
+from threading import RLock
+from typing import DefaultDict, Generic, List, Callable, Type, Dict, TypeVar, Iterable, Iterator, KeysView, Any, FrozenSet, NewType, Optional, Tuple, cast
 
 
 class Component:
     """Base class for all components in the ECS architecture."""
-    pass
+    __slots__ = ()
+
+
+class SparseComponent(Component):
+    """Base class for components stored outside of archetypes.
+
+    Adding or removing a sparse component does not move the entity to another
+    archetype, which suits tags and flags that are toggled often. Lookups and
+    query filtering on them cost a dict probe per entity instead.
+    """
+    __slots__ = ()
 
 
 class Event:
     """Base class for all events in the ECS system."""
-    pass
+    __slots__ = ()
 
 
 class EntityEvent(Event):
@@ -19,42 +33,60 @@ class EntityEvent(Event):
     Attributes:
         entity (EntityID): The ID of the entity that triggered or is related to this event.
     """
+    __slots__ = ()
     entity: EntityID
 
 
 class Resource:
     """Base class for global resources accessible across systems."""
-    pass
+    __slots__ = ()
 
 
 C = TypeVar('C', bound=Component)
 E = TypeVar('E', bound=Event)
 R = TypeVar('R', bound=Resource)
-EntityID = int
+EntityID = NewType('EntityID', int)
+
+# Guards the slow paths that fill World and QueryState caches, which
+# systems run concurrently by a Schedule may reach. It is kept out of the
+# World itself so worlds can still be copied and pickled.
+_cache_lock = RLock()
 
 
-@dataclass
+@dataclass(slots=True)
 class EventBuffer(Resource):
     """Buffers events across two phases: current and next.
 
     Used to ensure systems process only events from the previous tick,
     while new events are queued for the next tick.
     """
-    current: Dict[Type[Event], List[Event]] = field(default_factory=dict)
-    next: Dict[Type[Event], List[Event]] = field(default_factory=dict)
+    current: DefaultDict[Type[Event], List[Event]] = field(
+        default_factory=lambda: defaultdict(list))
+    next: DefaultDict[Type[Event], List[Event]] = field(
+        default_factory=lambda: defaultdict(list))
 
     def read(self, t: Type[E]) -> List[E]:
         """Returns all events of type `t` from the current buffer.
 
+        The returned list is the buffer's own storage and is emptied in place
+        by the next `update()`, so it is only valid until then. Copy it to
+        keep the events longer.
+
         Args:
             t: The event type to retrieve.
 
         Returns:
             A list of events of the specified type. Returns an empty list if none exist.
         """
-        if t in self.current:
-            return cast(List[E], self.current[t])
-        return []
+        return cast(List[E], self.current.get(t, []))
+
+    def has_events(self) -> bool:
+        """Checks whether the current buffer holds any events.
+
+        Returns:
+            True if `read` would return a non-empty list for some event type.
+        """
+        return any(self.current.values())
 
     def write(self, *events: Event):
         """Queues one or more events into the next buffer.
@@ -62,33 +94,351 @@ class EventBuffer(Resource):
         Args:
             *events: Variable-length list of events to queue.
         """
+        next_events = self.next
         for ev in events:
-            t = type(ev)
-            if t not in self.next:
-                self.next[t] = []
-            self.next[t].append(ev)
+            next_events[type(ev)].append(ev)
 
     def update(self):
         """Moves all queued events from 'next' to 'current' and clears 'next'.
 
-        Called at the end of each tick to prepare for the next frame.
+        Called at the end of each tick to prepare for the next frame. The two
+        buffers are swapped rather than copied, and the per-type lists are
+        emptied in place so they are reused on the following ticks.
         """
-        self.current = self.next.copy()
-        self.next.clear()
+        self.current, self.next = self.next, self.current
+        for events in self.next.values():
+            events.clear()
 
 
 @dataclass(slots=True, frozen=True)
 class Archetype(Generic[C]):
     """A grouping of entities that share the exact same set of component types.
 
-    Enables efficient querying by avoiding per-entity component checks.
+    Components are stored column-wise: one list per component type, aligned
+    row-by-row with `entities`. Enables efficient querying by avoiding
+    per-entity component checks and per-entity dict lookups.
 
     Attributes:
         components (FrozenSet[Type[Component]]): Set of component types defining this archetype.
+        mask (int): Bitmask of the component types, using the owning world's type bits.
         entities (List[EntityID]): List of entity IDs belonging to this archetype.
+        columns (Dict[Type[Component], List[Component]]): One component column per component type.
+        entity_row (Dict[EntityID, int]): Row index of each entity in `entities` and the columns.
+        added_ticks (Dict[Type[Component], List[int]]): Tick at which each component was added, per column.
+        changed_ticks (Dict[Type[Component], List[int]]): Tick at which each component was last set, per column.
     """
     components: FrozenSet[Type[C]]
+    mask: int = 0
     entities: List[EntityID] = field(default_factory=list)
+    columns: Dict[Type[C], List[C]] = field(default_factory=dict)
+    entity_row: Dict[EntityID, int] = field(default_factory=dict)
+    added_ticks: Dict[Type[C], List[int]] = field(default_factory=dict)
+    changed_ticks: Dict[Type[C], List[int]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        for t in self.components:
+            self.columns.setdefault(t, [])
+            self.added_ticks.setdefault(t, [])
+            self.changed_ticks.setdefault(t, [])
+
+    def push(
+            self,
+            entity: EntityID,
+            components: Dict[Type[C], C],
+            added_ticks: Dict[Type[C], int],
+            changed_ticks: Dict[Type[C], int]
+    ) -> int:
+        """Appends an entity and its components as a new row.
+
+        Args:
+            entity: The entity ID.
+            components: The entity's components, keyed by type. Must cover
+                exactly the component types of this archetype.
+            added_ticks: The added tick of each component, keyed by type.
+            changed_ticks: The changed tick of each component, keyed by type.
+
+        Returns:
+            The row index of the entity.
+        """
+        row = len(self.entities)
+        self.entities.append(entity)
+        self.entity_row[entity] = row
+        for t, column in self.columns.items():
+            column.append(components[t])
+            self.added_ticks[t].append(added_ticks[t])
+            self.changed_ticks[t].append(changed_ticks[t])
+        return row
+
+    def extend(
+            self,
+            entities: List[EntityID],
+            columns: Dict[Type[C], Iterable[C]],
+            tick: int
+    ):
+        """Appends many entities at once, one column at a time.
+
+        Args:
+            entities: The entity IDs to append.
+            columns: For each component type of this archetype, the components
+                of the new entities, in the same order as `entities`.
+            tick: The added and changed tick of the new components.
+        """
+        start = len(self.entities)
+        self.entities.extend(entities)
+        self.entity_row.update(zip(entities, range(start, start + len(entities))))
+        ticks = [tick] * len(entities)
+        for t, column in self.columns.items():
+            column.extend(columns[t])
+            self.added_ticks[t].extend(ticks)
+            self.changed_ticks[t].extend(ticks)
+
+    def swap_remove(
+            self,
+            entity: EntityID
+    ) -> Tuple[Dict[Type[C], C], Dict[Type[C], int], Dict[Type[C], int]]:
+        """Removes an entity's row by moving the last row into its place.
+
+        Args:
+            entity: The entity ID.
+
+        Returns:
+            The removed components, added ticks and changed ticks, each keyed by type.
+
+        Raises:
+            KeyError: If the entity does not belong to this archetype.
+        """
+        row = self.entity_row.pop(entity)
+        removed: Dict[Type[C], C] = {}
+        added: Dict[Type[C], int] = {}
+        changed: Dict[Type[C], int] = {}
+        for t, column in self.columns.items():
+            removed[t] = _swap_pop(column, row)
+            added[t] = _swap_pop(self.added_ticks[t], row)
+            changed[t] = _swap_pop(self.changed_ticks[t], row)
+        last = self.entities.pop()
+        if last != entity:
+            self.entities[row] = last
+            self.entity_row[last] = row
+        return removed, added, changed
+
+
+@dataclass(slots=True)
+class SparseSet(Generic[C]):
+    """Storage of one sparse component type, keyed by entity.
+
+    Attributes:
+        components (Dict[EntityID, Component]): The component of each entity having it.
+        added_ticks (Dict[EntityID, int]): Tick at which each entity's component was added.
+        changed_ticks (Dict[EntityID, int]): Tick at which each entity's component was last set.
+    """
+    components: Dict[EntityID, C] = field(default_factory=dict)
+    added_ticks: Dict[EntityID, int] = field(default_factory=dict)
+    changed_ticks: Dict[EntityID, int] = field(default_factory=dict)
+
+    def insert(self, entity: EntityID, component: C, tick: int):
+        """Sets an entity's component, marking it changed (and added if new).
+
+        Args:
+            entity: The entity ID.
+            component: The component instance.
+            tick: The current world tick.
+        """
+        if entity not in self.components:
+            self.added_ticks[entity] = tick
+        self.components[entity] = component
+        self.changed_ticks[entity] = tick
+
+    def remove(self, entity: EntityID) -> C:
+        """Removes and returns an entity's component.
+
+        Args:
+            entity: The entity ID.
+
+        Returns:
+            The removed component.
+
+        Raises:
+            KeyError: If the entity does not have the component.
+        """
+        component = self.components.pop(entity)
+        del self.added_ticks[entity]
+        del self.changed_ticks[entity]
+        return component
+
+
+def _filter_ticks(
+        entities: List[EntityID],
+        tick_columns: List[List[int]],
+        threshold: int
+) -> List[EntityID]:
+    """Returns the entities whose ticks are all at least `threshold`.
+
+    `tick_columns` are row-aligned with `entities`. Several columns are first
+    folded into one with `map(min, ...)`, so the scan is always a single
+    comparison per row over a flat int sequence.
+    """
+    if len(tick_columns) == 1:
+        ticks: Iterable[int] = tick_columns[0]
+    else:
+        ticks = map(min, *tick_columns)
+    return [eid for eid, tick in zip(entities, ticks) if tick >= threshold]
+
+
+def _swap_pop(column: List[Any], row: int) -> Any:
+    """Removes and returns `column[row]`, filling the hole with the last element."""
+    value = column[row]
+    column[row] = column[-1]
+    column.pop()
+    return value
+
+
+@dataclass(slots=True)
+class QueryState:
+    """Precomputed state of a query, reused across ticks.
+
+    Holds the query's component type sets, their bitmasks and the archetypes
+    matching them. The matched list is only rebuilt when the world has
+    created new archetypes since it was last computed. Sparse component
+    types are kept apart, since they take no part in archetype matching and
+    are checked per entity instead.
+
+    A state belongs to the world that created it, since its bitmasks and
+    archetype version are only meaningful there, and always queries that
+    world.
+
+    Attributes:
+        world (World): The world the state was created by.
+        withs (FrozenSet[Type[Component]]): Component types the entity must have.
+        without (FrozenSet[Type[Component]]): Component types the entity must NOT have.
+        changed (FrozenSet[Type[Component]]): Component types that must have changed in the last tick.
+        added (FrozenSet[Type[Component]]): Component types that must have been added in the last tick.
+        sparse_withs (FrozenSet[Type[Component]]): Sparse counterpart of `withs`.
+        sparse_without (FrozenSet[Type[Component]]): Sparse counterpart of `without`.
+        sparse_changed (FrozenSet[Type[Component]]): Sparse counterpart of `changed`.
+        sparse_added (FrozenSet[Type[Component]]): Sparse counterpart of `added`.
+        required_mask (int): Bitmask of the types every matched archetype must have.
+        without_mask (int): Bitmask of the types no matched archetype may have.
+        archetypes (List[Archetype]): Archetypes matched at `version`.
+        version (int): The world archetype version `archetypes` was computed at.
+        filtered (bool): Whether entities need per-row filtering beyond archetype matching.
+        sparse_required (FrozenSet[Type[Component]]): Sparse types every entity must have.
+    """
+    world: World = field(repr=False, compare=False)
+    withs: FrozenSet[Type[Component]]
+    without: FrozenSet[Type[Component]] = frozenset()
+    changed: FrozenSet[Type[Component]] = frozenset()
+    added: FrozenSet[Type[Component]] = frozenset()
+    sparse_withs: FrozenSet[Type[Component]] = frozenset()
+    sparse_without: FrozenSet[Type[Component]] = frozenset()
+    sparse_changed: FrozenSet[Type[Component]] = frozenset()
+    sparse_added: FrozenSet[Type[Component]] = frozenset()
+    required_mask: int = 0
+    without_mask: int = 0
+    archetypes: List[Archetype[Component]] = field(default_factory=list)
+    version: int = -1
+    filtered: bool = field(init=False)
+    sparse_required: FrozenSet[Type[Component]] = field(init=False)
+
+    def __post_init__(self):
+        self.sparse_required = self.sparse_withs | self.sparse_changed | self.sparse_added
+        self.filtered = bool(
+            self.changed or self.added or self.sparse_withs
+            or self.sparse_without or self.sparse_changed or self.sparse_added
+        )
+
+    def matched(self) -> List[Archetype[Component]]:
+        """Returns the archetypes of the world matching this query.
+
+        Archetypes lacking a tracked (changed or added) type are excluded,
+        since none of their entities could pass the tick filter. Only the
+        archetypes containing the rarest required type are checked.
+
+        Returns:
+            The matching archetypes.
+        """
+        world = self.world
+        if self.version != world._archetype_version:
+            with _cache_lock:
+                version = world._archetype_version
+                if self.version != version:
+                    required = self.required_mask
+                    without = self.without_mask
+                    required_types = self.withs | self.changed | self.added
+                    if required_types:
+                        candidates: Iterable[Archetype[Component]] = min(
+                            (world.component_index.get(t, ()) for t in required_types), key=len)
+                    else:
+                        candidates = world.archetypes.values()
+                    self.archetypes = [
+                        archetype for archetype in candidates
+                        if archetype.mask & required == required and not archetype.mask & without
+                    ]
+                    self.version = version
+        return self.archetypes
+
+    def iter(self) -> Iterator[EntityID]:
+        """Iterates the entities of the world matching this query.
+
+        Unlike `collect`, no list is built, so the world must not be
+        structurally modified while iterating.
+
+        Yields:
+            Matching entity IDs.
+        """
+        if not self.filtered:
+            for archetype in self.matched():
+                yield from archetype.entities
+            return
+        threshold = self.world.tick - 1
+        for archetype in self.matched():
+            yield from self._filter(archetype, threshold)
+
+    def collect(self) -> List[EntityID]:
+        """Returns a list of the entities of the world matching this query.
+
+        Returns:
+            A list of matching entity IDs.
+        """
+        result: List[EntityID] = []
+        if not self.filtered:
+            for archetype in self.matched():
+                result.extend(archetype.entities)
+            return result
+        threshold = self.world.tick - 1
+        for archetype in self.matched():
+            result.extend(self._filter(archetype, threshold))
+        return result
+
+    def _filter(
+            self,
+            archetype: Archetype[Component],
+            threshold: int
+    ) -> List[EntityID]:
+        """Applies the changed/added and sparse filters to the entities of one archetype."""
+        world = self.world
+        entities = archetype.entities
+        if self.changed or self.added:
+            tick_columns = [archetype.changed_ticks[t] for t in self.changed]
+            tick_columns += [archetype.added_ticks[t] for t in self.added]
+            entities = _filter_ticks(entities, tick_columns, threshold)
+        for t in self.sparse_required:
+            sparse = world.sparse.get(t)
+            if sparse is None:
+                return []
+            components = sparse.components
+            entities = [eid for eid in entities if eid in components]
+        for t in self.sparse_without:
+            sparse = world.sparse.get(t)
+            if sparse is not None:
+                components = sparse.components
+                entities = [eid for eid in entities if eid not in components]
+        for t in self.sparse_changed:
+            ticks = world.sparse[t].changed_ticks
+            entities = [eid for eid in entities if ticks[eid] >= threshold]
+        for t in self.sparse_added:
+            ticks = world.sparse[t].added_ticks
+            entities = [eid for eid in entities if ticks[eid] >= threshold]
+        return entities
 
 
 @dataclass(slots=True)
@@ -98,17 +448,22 @@ class World:
     Manages the ECS world state, including entity-component relationships,
     resource storage, and event dispatching.
     """
-    archetypes: Dict[FrozenSet[Type[Component]],
-                     Archetype] = field(default_factory=dict)
+    archetypes: Dict[int, Archetype] = field(default_factory=dict)
     entity_archetype: Dict[EntityID, Archetype[Component]
                            ] = field(default_factory=dict)
-    entity_components: Dict[EntityID, Dict[Type[Component], Component]
-                            ] = field(default_factory=dict)
     _next_id: int = 0
     resources: Dict[Type[Resource], Resource] = field(default_factory=dict)
     tick: int = 0
-    change_ticks: Dict[EntityID, Dict[Type[Component], int]
-                       ] = field(default_factory=dict)
+    _archetype_version: int = 0
+    _type_bits: Dict[Type[Component], int] = field(default_factory=dict)
+    component_index: Dict[Type[Component], List[Archetype[Component]]
+                          ] = field(default_factory=dict)
+    _sparse_mask: int = 0
+    _spawn_masks: Dict[Tuple[Type[Component], ...], int] = field(default_factory=dict)
+    sparse: Dict[Type[Component], SparseSet[Component]
+                 ] = field(default_factory=dict)
+    _query_states: Dict[Tuple[Tuple[Type[Component], ...], ...],
+                        QueryState] = field(default_factory=dict)
 
     def spawn(self, *components: Component) -> EntityID:
         """Creates a new entity with the given components.
@@ -119,40 +474,129 @@ class World:
         Returns:
             The unique ID of the newly created entity.
         """
-        e_id = EntityID(self._next_id)
+        e_id = cast(EntityID, self._next_id)
         self._next_id += 1
-        component_type = frozenset(type(c) for c in components)
-        self.change_ticks[e_id] = {type(c): self.tick for c in components}
-        self.entity_components[e_id] = {type(c): c for c in components}
-        if component_type not in self.archetypes:
-            archetype = Archetype(component_type, [e_id])
-            self.archetypes[component_type] = archetype
-        else:
-            archetype = self.archetypes[component_type]
-            archetype.entities.append(e_id)
+        row = {type(c): c for c in components}
+        types = tuple(row)
+        mask = self._spawn_masks.get(types)
+        if mask is None:
+            mask = self._spawn_masks[types] = self._mask(types)
+        if mask & self._sparse_mask:
+            for t in [t for t in row if issubclass(t, SparseComponent)]:
+                self._sparse_set(t).insert(e_id, row.pop(t), self.tick)
+            mask &= ~self._sparse_mask
+        ticks = dict.fromkeys(row, self.tick)
+        archetype = self._get_archetype(mask)
+        archetype.push(e_id, row, ticks, ticks)
         self.entity_archetype[e_id] = archetype
         return e_id
 
+    def spawn_batch(self, component_tuples: Iterable[Tuple[Component, ...]]) -> List[EntityID]:
+        """Creates many entities sharing the same component types.
+
+        The archetype is looked up once and each of its columns is extended
+        in a single call, which is much cheaper than calling `spawn` per entity.
+
+        Args:
+            component_tuples: One tuple of components per new entity. Every
+                tuple must hold the same component types in the same order.
+
+        Returns:
+            The IDs of the new entities, in order.
+
+        Raises:
+            ValueError: If the tuples do not all share the same component types,
+                or a tuple holds the same component type twice.
+        """
+        rows = list(component_tuples)
+        if not rows:
+            return []
+        types = tuple(map(type, rows[0]))
+        if len(set(types)) != len(types):
+            raise ValueError(f"Duplicate component types in {types}")
+        for components in rows:
+            if tuple(map(type, components)) != types:
+                raise ValueError(
+                    f"Expected components {types}, got {tuple(map(type, components))}")
+        start = self._next_id
+        self._next_id += len(rows)
+        entities = cast(List[EntityID], list(range(start, self._next_id)))
+        columns = dict(zip(types, zip(*rows)))
+        mask = self._mask(types)
+        if mask & self._sparse_mask:
+            for t in types:
+                if issubclass(t, SparseComponent):
+                    sparse = self._sparse_set(t)
+                    for e_id, component in zip(entities, columns.pop(t)):
+                        sparse.insert(e_id, component, self.tick)
+            mask &= ~self._sparse_mask
+        archetype = self._get_archetype(mask)
+        archetype.extend(entities, columns, self.tick)
+        self.entity_archetype.update(dict.fromkeys(entities, archetype))
+        return entities
+
+    def _get_archetype(self, mask: int) -> Archetype[Component]:
+        """Returns the archetype for a component type bitmask, creating it if needed."""
+        archetype = self.archetypes.get(mask)
+        if archetype is None:
+            component_type = frozenset(
+                t for t, bit in self._type_bits.items() if mask & bit)
+            archetype = Archetype(component_type, mask)
+            self.archetypes[mask] = archetype
+            for t in component_type:
+                self.component_index.setdefault(t, []).append(archetype)
+            self._archetype_version += 1
+        return archetype
+
+    def _mask(self, component_types: Iterable[Type[Component]]) -> int:
+        """Returns the bitmask of a set of component types.
+
+        Each component type is assigned its own bit the first time it is seen.
+        """
+        bits = self._type_bits
+        mask = 0
+        for t in component_types:
+            mask |= bits.get(t) or self._bit(t)
+        return mask
+
+    def _bit(self, component_type: Type[Component]) -> int:
+        """Returns the bit of a component type, assigning a new one if needed."""
+        bit = self._type_bits.get(component_type)
+        if bit is None:
+            with _cache_lock:
+                bit = self._type_bits.get(component_type)
+                if bit is None:
+                    bit = self._type_bits[component_type] = 1 << len(self._type_bits)
+                    if issubclass(component_type, SparseComponent):
+                        self._sparse_mask |= bit
+        return bit
+
+    def _sparse_set(self, component_type: Type[Component]) -> SparseSet[Component]:
+        """Returns the storage of a sparse component type, creating it if needed."""
+        sparse = self.sparse.get(component_type)
+        if sparse is None:
+            sparse = self.sparse[component_type] = SparseSet()
+        return sparse
+
     def despawn(self, entity: EntityID):
         """Removes an entity and all its components from the world.
 
         Args:
             entity: The ID of the entity to remove.
         """
-        if entity not in self.entity_archetype:
-            return
-        archetype = self.entity_archetype[entity]
-        archetype.entities.remove(entity)
-        self.entity_archetype.pop(entity)
-        if entity in self.entity_components:
-            self.entity_components.pop(entity)
-        self.change_ticks.pop(entity, None)
+        archetype = self.entity_archetype.pop(entity, None)
+        if archetype is not None:
+            archetype.swap_remove(entity)
+            for sparse in self.sparse.values():
+                if entity in sparse.components:
+                    sparse.remove(entity)
 
     def query(
             self,
             *withs: Type[C],
             without: Iterable[Type[C]] = (),
-            changed: Set[Type[C]] = set()
+            changed: Iterable[Type[C]] = (),
+            added: Iterable[Type[C]] = ()
     ) -> List[EntityID]:
         """Finds entities matching the specified component constraints.
 
@@ -160,33 +604,117 @@ class World:
             *withs: Component types the entity must have.
             without: Component types the entity must NOT have.
             changed: Only include entities whose listed components changed in the last tick.
+            added: Only include entities whose listed components were added in the last tick.
 
         Returns:
             A list of matching entity IDs.
         """
-        with_set = frozenset(withs)
-        without_set = frozenset(without)
-        changed_set = frozenset(changed)
-        current_tick = self.tick
-        result: List[EntityID] = []
-        for archetype_key, archetype in self.archetypes.items():
-            if not with_set.issubset(archetype_key):
-                continue
-            if archetype_key & without_set:
-                continue
-            if changed_set:
-                filter_list = []
-                for eid in archetype.entities:
-                    if all(
-                            self.change_ticks.get(eid, {}).get(
-                                comp_type, -1) >= current_tick - 1
-                            for comp_type in changed_set
-                    ):
-                        filter_list.append(eid)
-                result.extend(filter_list)
-            else:
-                result.extend(archetype.entities)
-        return result
+        state = self.query_state(
+            withs, tuple(without), tuple(changed), tuple(added))
+        return state.collect()
+
+    def query_state(
+            self,
+            withs: Tuple[Type[C], ...],
+            without: Tuple[Type[C], ...] = (),
+            changed: Tuple[Type[C], ...] = (),
+            added: Tuple[Type[C], ...] = ()
+    ) -> QueryState:
+        """Returns the cached query state for the given component constraints.
+
+        States are interned by their argument tuples, so systems calling this
+        every tick with the same types get the same object back, together
+        with its precomputed type sets and matched archetypes. Creating a
+        state is guarded by a lock, so systems running concurrently
+        in a `Schedule` may query safely.
+
+        Args:
+            withs: Component types the entity must have.
+            without: Component types the entity must NOT have.
+            changed: Component types that must have changed in the last tick.
+            added: Component types that must have been added in the last tick.
+
+        Returns:
+            The query state.
+        """
+        key = (withs, without, changed, added)
+        state = self._query_states.get(key)
+        if state is None:
+            with _cache_lock:
+                state = self._query_states.get(key)
+                if state is None:
+                    dense = [frozenset(t for t in ts if not issubclass(t, SparseComponent))
+                             for ts in key]
+                    sparse = [frozenset(ts) - d for ts, d in zip(key, dense)]
+                    state = QueryState(
+                        self,
+                        *dense,
+                        *sparse,
+                        required_mask=self._mask(dense[0] | dense[2] | dense[3]),
+                        without_mask=self._mask(dense[1])
+                    )
+                    self._query_states[key] = state
+        return state
+
+    def query_columns(
+            self,
+            *withs: Type[C],
+            without: Iterable[Type[C]] = ()
+    ) -> Iterator[Tuple[List[EntityID], Tuple[List[Any], ...]]]:
+        """Iterates the component columns of every archetype matching the constraints.
+
+        Yields one `(entities, columns)` pair per non-empty archetype, where
+        `columns` holds the column of each type in `withs`, in order. Rows are
+        aligned, so systems can iterate with `zip(entities, *columns)` without
+        any per-entity lookup. The world must not be structurally modified
+        (spawn, despawn, add or remove components) while iterating.
+
+        Args:
+            *withs: Component types the entity must have.
+            without: Component types the entity must NOT have.
+
+        Returns:
+            An iterator of tuples of the archetype's entity list and its requested columns.
+
+        Raises:
+            ValueError: If a sparse component type is given, as those have no columns.
+                Raised by the call itself, before iteration starts.
+        """
+        state = self.query_state(withs, tuple(without))
+        if state.sparse_withs or state.sparse_without:
+            raise ValueError("query_columns does not support sparse components")
+        return (
+            (archetype.entities, tuple(archetype.columns[t] for t in withs))
+            for archetype in state.matched()
+            if archetype.entities
+        )
+
+    def query_components(
+            self,
+            *withs: Type[C],
+            without: Iterable[Type[C]] = ()
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Iterates the components of every entity matching the constraints.
+
+        Yields one tuple per entity holding its component of each type in
+        `withs`, in order, read straight from the archetype columns. Use this
+        instead of `query` followed by `get_component` when the entity IDs
+        themselves are not needed. The same structural-modification rules as
+        `query_columns` apply.
+
+        Args:
+            *withs: Component types the entity must have.
+            without: Component types the entity must NOT have.
+
+        Returns:
+            An iterator of tuples of component references.
+
+        Raises:
+            ValueError: If a sparse component type is given, as those have no columns.
+                Raised by the call itself, before iteration starts.
+        """
+        columns = self.query_columns(*withs, without=without)
+        return chain.from_iterable(zip(*c) for _, c in columns)
 
     def add_resource(self, resource: R) -> R:
         """Stores a global resource in the world.
@@ -241,7 +769,32 @@ class World:
         Raises:
             KeyError: If the entity or component does not exist.
         """
-        return cast(C, self.entity_components[entity][component_type])
+        archetype = self.entity_archetype[entity]
+        column = archetype.columns.get(component_type)
+        if column is None:
+            return cast(C, self.sparse[component_type].components[entity])
+        return cast(C, column[archetype.entity_row[entity]])
+
+    def try_get_component(self, entity: EntityID, component_type: Type[C]) -> Optional[C]:
+        """Retrieves a specific component from an entity if it has one.
+
+        Combines `has_component` and `get_component` into a single lookup.
+
+        Args:
+            entity: The entity ID.
+            component_type: The type of component to retrieve.
+
+        Returns:
+            The component instance, or None if the entity or component does not exist.
+        """
+        archetype = self.entity_archetype.get(entity)
+        if archetype is None:
+            return None
+        column = archetype.columns.get(component_type)
+        if column is None:
+            sparse = self.sparse.get(component_type)
+            return None if sparse is None else cast(Optional[C], sparse.components.get(entity))
+        return cast(C, column[archetype.entity_row[entity]])
 
     def add_component(self, entity: EntityID, component: Component) -> Component:
         """Adds a component to an existing entity.
@@ -256,22 +809,24 @@ class World:
         Raises:
             ValueError: If the entity does not exist.
         """
-        if entity not in self.entity_components:
+        if entity not in self.entity_archetype:
             raise ValueError(f"Entity {entity} does not exist")
-        current_components = self.entity_components[entity]
         comp_type = type(component)
-        self.change_ticks[entity][comp_type] = self.tick
+        if issubclass(comp_type, SparseComponent):
+            self._sparse_set(comp_type).insert(entity, component, self.tick)
+            return component
         old_archetype = self.entity_archetype[entity]
-        current_components[comp_type] = component
-        new_component_type = frozenset(
-            set(old_archetype.components) | {comp_type})
-        old_archetype.entities.remove(entity)
-        if new_component_type not in self.archetypes:
-            self.archetypes[new_component_type] = Archetype(
-                new_component_type, [entity])
-        else:
-            self.archetypes[new_component_type].entities.append(entity)
-        new_archetype = self.archetypes[new_component_type]
+        if comp_type in old_archetype.columns:
+            index = old_archetype.entity_row[entity]
+            old_archetype.columns[comp_type][index] = component
+            old_archetype.changed_ticks[comp_type][index] = self.tick
+            return component
+        row, added, changed = old_archetype.swap_remove(entity)
+        row[comp_type] = component
+        added[comp_type] = changed[comp_type] = self.tick
+        new_archetype = self._get_archetype(
+            old_archetype.mask | self._bit(comp_type))
+        new_archetype.push(entity, row, added, changed)
         self.entity_archetype[entity] = new_archetype
         return component
 
@@ -288,20 +843,17 @@ class World:
         Raises:
             KeyError: If the entity or component does not exist.
         """
-        current_components = self.entity_components[entity]
-        component_to_remove = current_components.pop(component_type)
         old_archetype = self.entity_archetype[entity]
-        new_component_type = frozenset(
-            set(old_archetype.components) - {component_type})
-        old_archetype.entities.remove(entity)
-        if new_component_type not in self.archetypes:
-            self.archetypes[new_component_type] = Archetype(
-                new_component_type, [entity])
-        else:
-            self.archetypes[new_component_type].entities.append(entity)
-        new_archetype = self.archetypes[new_component_type]
+        if component_type not in old_archetype.columns:
+            if issubclass(component_type, SparseComponent):
+                return cast(C, self.sparse[component_type].remove(entity))
+            raise KeyError(component_type)
+        row, added, changed = old_archetype.swap_remove(entity)
+        component_to_remove = row.pop(component_type)
+        new_archetype = self._get_archetype(
+            old_archetype.mask & ~self._type_bits[component_type])
+        new_archetype.push(entity, row, added, changed)
         self.entity_archetype[entity] = new_archetype
-        self.change_ticks[entity].pop(component_type, None)
         return cast(C, component_to_remove)
 
     def has_component(self, entity: EntityID, component_type: Type[C]) -> bool:
@@ -314,9 +866,13 @@ class World:
         Returns:
             True if the entity exists and has the component; False otherwise.
         """
-        if entity not in self.entity_components:
+        archetype = self.entity_archetype.get(entity)
+        if archetype is None:
             return False
-        return component_type in self.entity_components[entity]
+        if component_type in archetype.columns:
+            return True
+        sparse = self.sparse.get(component_type)
+        return sparse is not None and entity in sparse.components
 
     def get_entities(self) -> List[EntityID]:
         """Returns a list of all active entity IDs.
@@ -324,7 +880,18 @@ class World:
         Returns:
             A list of entity IDs currently in the world.
         """
-        return list(self.entity_archetype.keys())
+        return list(self.entity_archetype)
+
+    def iter_entities(self) -> KeysView[EntityID]:
+        """Returns a live view of all active entity IDs, without copying.
+
+        Use `get_entities` instead when entities may be spawned or despawned
+        while iterating.
+
+        Returns:
+            A view of the entity IDs currently in the world.
+        """
+        return self.entity_archetype.keys()
 
 
 System = Callable[[World], None]
@@ -335,25 +902,113 @@ class Schedule:
     """Manages and executes a sequence of systems each tick.
 
     Systems are functions that operate on the world and event buffer.
+    Systems registered with their component access (`reads`/`writes`) may
+    run concurrently with neighbouring systems they do not conflict with;
+    all other systems run alone, in registration order.
+
+    Concurrent systems run on a thread pool that is created on first use.
+    Call `close()`, or use the schedule as a context manager, to shut it
+    down.
+
+    Attributes:
+        systems (List[System]): Registered systems, in order.
+        access (List[Optional[Tuple[FrozenSet[Type[Component]], FrozenSet[Type[Component]]]]]):
+            The `(reads, writes)` component sets of each system, or None if undeclared.
+        max_workers (Optional[int]): Thread pool size for concurrent systems.
     """
     systems: List[System] = field(default_factory=list)
+    access: List[Optional[Tuple[FrozenSet[Type[Component]], FrozenSet[Type[Component]]]]
+                 ] = field(default_factory=list)
+    max_workers: Optional[int] = None
+    _stages: Optional[Tuple[Tuple[System, ...], ...]] = None
+    _executor: Optional[ThreadPoolExecutor] = None
 
-    def add(self, *system: System):
+    def add(
+            self,
+            *system: System,
+            reads: Optional[Iterable[Type[Component]]] = None,
+            writes: Optional[Iterable[Type[Component]]] = None
+    ):
         """Registers one or more systems to be run in order.
 
+        Declaring `reads` and/or `writes` allows the systems to run in
+        parallel with adjacent declared systems whose access does not
+        conflict (no component written by one is read or written by the
+        other). Such systems must only touch the declared components and
+        must not spawn, despawn, add or remove components.
+
         Args:
             *system: One or more system functions.
+            reads: Component types the systems only read.
+            writes: Component types the systems modify.
         """
+        if reads is None and writes is None:
+            access = None
+        else:
+            access = (frozenset(reads or ()), frozenset(writes or ()))
         self.systems.extend(system)
+        self.access.extend([access] * len(system))
+        self._stages = None
+
+    def _build_stages(self) -> Tuple[Tuple[System, ...], ...]:
+        """Groups consecutive non-conflicting declared systems into stages."""
+        stages: List[List[System]] = []
+        stage_reads: FrozenSet[Type[Component]] = frozenset()
+        stage_writes: FrozenSet[Type[Component]] = frozenset()
+        parallel = False
+        for system, access in zip(self.systems, self.access):
+            if access is None:
+                stages.append([system])
+                parallel = False
+                continue
+            reads, writes = access
+            if parallel and not (
+                    writes & (stage_reads | stage_writes) or reads & stage_writes):
+                stages[-1].append(system)
+                stage_reads |= reads
+                stage_writes |= writes
+            else:
+                stages.append([system])
+                stage_reads, stage_writes = reads, writes
+                parallel = True
+        return tuple(map(tuple, stages))
+
+    def close(self):
+        """Shuts down the thread pool used for concurrent systems, if any.
+
+        The schedule can still be run afterwards; a new pool is created when
+        it is next needed.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> Schedule:
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
 
     def run(self, world: World):
-        """Executes all registered systems in sequence.
+        """Executes all registered systems.
 
-        Increments the world tick before running systems.
+        Increments the world tick before running systems. Stages of
+        non-conflicting declared systems are run on a thread pool; the
+        schedule waits for each stage before starting the next.
 
         Args:
             world: The world context to pass to each system.
         """
+        stages = self._stages
+        if stages is None:
+            stages = self._stages = self._build_stages()
         world.tick += 1
-        for system in self.systems:
-            system(world)
+        for stage in stages:
+            if len(stage) == 1:
+                stage[0](world)
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers)
+            futures = [self._executor.submit(system, world) for system in stage]
+            for future in futures:
+                future.result()
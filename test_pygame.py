@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Tuple
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
 
 import pygame
 
@@ -13,7 +13,7 @@ from pyecs import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class Node(Component):
     x: float = 0.0
     y: float = 0.0
@@ -21,30 +21,33 @@ class Node(Component):
     height: float = 50.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Text(Component):
     content: str = ""
+    rendered: Optional[str] = field(default=None, repr=False, compare=False)
+    surface: Optional[pygame.Surface] = field(
+        default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class Interaction(Component):
     hover: bool = False
     click: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Button(Component):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ClickEvent(Event):
     entity: EntityID
 
 
-@dataclass
+@dataclass(slots=True)
 class HelloWorldButton(Component):
-    counter = 0
+    counter: int = 0
 
 
 @dataclass
@@ -53,7 +56,7 @@ class State:
     clicked_pos: Tuple[float, float] = (0, 0)
 
 
-@dataclass
+@dataclass(slots=True)
 class MoveToTarget(Component):
     x: float = 0.0
     y: float = 0.0
@@ -77,53 +80,64 @@ my_button = world.spawn(
 
 def render_system(w: World):
     screen.fill('white')
-    for entity in w.query(Node, Text):
-        node = w.get_component(entity, Node)
-        pygame.draw.rect(
-            screen, 'blue', (node.x, node.y, node.width, node.height))
-        txt = w.get_component(entity, Text)
-        surf = font.render(txt.content, True, 'white')
-        screen.blit(surf, (node.x, node.y))
+    for _, (nodes, texts) in w.query_columns(Node, Text):
+        for node, txt in zip(nodes, texts):
+            pygame.draw.rect(
+                screen, 'blue', (node.x, node.y, node.width, node.height))
+            if txt.surface is None or txt.rendered != txt.content:
+                txt.surface = font.render(txt.content, True, 'white')
+                txt.rendered = txt.content
+            screen.blit(txt.surface, (node.x, node.y))
     pygame.display.flip()
 
 
 def mouse_system(w: World):
-    buf = w.get_resource(EventBuffer)
+    clicks = []
     for ev in pygame.event.get():
         if ev.type == pygame.QUIT:
             state.running = False
         if ev.type == pygame.MOUSEBUTTONDOWN:
-
-            x, y = pygame.mouse.get_pos()
-            state.clicked_pos = (x, y)
-            for entity in w.query(Button, Node):
-                node = w.get_component(entity, Node)
-                if node.x < x < node.x + node.width and node.y < y < node.y + node.height:
-                    buf.write(ClickEvent(entity))
-            for entity in w.query(MoveToTarget):
-                move_target = w.get_component(entity, MoveToTarget)
-                move_target.x = x
-                move_target.y = y
+            clicks.append(ev.pos)
+    if not clicks:
+        return
+    buf = w.get_resource(EventBuffer)
+    columns = list(w.query_columns(Node, Button))
+    for x, y in clicks:
+        hit = next((
+            entity
+            for entities, (nodes, _) in reversed(columns)
+            for entity, node in zip(reversed(entities), reversed(nodes))
+            if node.x < x < node.x + node.width and node.y < y < node.y + node.height
+        ), None)
+        if hit is not None:
+            buf.write(ClickEvent(hit))
+    x, y = clicks[-1]
+    state.clicked_pos = (x, y)
+    for _, (move_targets,) in w.query_columns(MoveToTarget):
+        for move_target in move_targets:
+            move_target.x = x
+            move_target.y = y
 
 
 def handle_hello_world_button(w: World):
-    buf = w.get_resource(EventBuffer)
-    for event in buf.read(ClickEvent):
-        if w.has_component(event.entity, HelloWorldButton):
-            hello_button = w.get_component(event.entity, HelloWorldButton)
+    events = w.get_resource(EventBuffer).read(ClickEvent)
+    if not events:
+        return
+    for event in events:
+        hello_button = w.try_get_component(event.entity, HelloWorldButton)
+        if hello_button is not None:
             hello_button.counter += 1
             w.get_component(event.entity, Text).content = str(
                 hello_button.counter)
 
 
 def move_system(w: World):
-    for entity in w.query(Node, MoveToTarget):
-        node = w.get_component(entity, Node)
-        move_target = w.get_component(entity, MoveToTarget)
-        dx = move_target.x - node.x
-        dy = move_target.y - node.y
-        node.x += (dx - node.width / 2) / 5
-        node.y += (dy - node.height / 2) / 5
+    for _, (nodes, move_targets) in w.query_columns(Node, MoveToTarget):
+        for node, move_target in zip(nodes, move_targets):
+            dx = move_target.x - node.x
+            dy = move_target.y - node.y
+            node.x += (dx - node.width / 2) / 5
+            node.y += (dy - node.height / 2) / 5
 
 
 def setup(w: World):
@@ -1,11 +1,14 @@
 from dataclasses import dataclass, field
 import sys
+from typing import Dict, List, Optional, Tuple
 from PySide6.QtCore import (
     QObject,
     QEvent,
     QTimer,
+    QPointF,
     QRectF,
     QRect,
+    Qt,
 )
 from PySide6.QtGui import (
     QCloseEvent,
@@ -18,30 +21,35 @@ from PySide6.QtGui import (
     QGuiApplication,
     QPainter,
     QFont,
+    QStaticText,
 )
 from pyecs import (
     Component, EntityEvent, Schedule,
-    System, EntityID, World, EventBuffer, Event,
+    System, EntityID, World, EventBuffer, Event, Resource,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class ClickEvent(Event):
     x: float
     y: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ClickEntityEvent(EntityEvent):
     entity: EntityID
 
 
-@dataclass
+@dataclass(slots=True)
 class Counter(Component):
     value: int = 0
+    label: QStaticText = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        self.label = QStaticText(str(self.value))
 
-@dataclass
+
+@dataclass(slots=True)
 class Rect(Component):
     x: float = 0
     y: float = 0
@@ -50,27 +58,114 @@ class Rect(Component):
     color: QColor = field(default_factory=lambda: QColor(255, 0, 0))
 
 
+@dataclass(slots=True)
+class SpatialGrid(Resource):
+    cell_size: float = 100
+    cells: Dict[Tuple[int, int], List[EntityID]] = field(default_factory=dict)
+    entity_cells: Dict[EntityID, List[Tuple[int, int]]
+                       ] = field(default_factory=dict)
+    bounds: Dict[EntityID, Tuple[float, float, float, float]
+                 ] = field(default_factory=dict)
+
+    def insert(self, entity: EntityID, x: float, y: float, w: float, h: float):
+        self.remove(entity)
+        size = self.cell_size
+        keys = [
+            (cx, cy)
+            for cx in range(int(x // size), int((x + w) // size) + 1)
+            for cy in range(int(y // size), int((y + h) // size) + 1)
+        ]
+        for key in keys:
+            self.cells.setdefault(key, []).append(entity)
+        self.entity_cells[entity] = keys
+        self.bounds[entity] = (x, y, x + w, y + h)
+
+    def remove(self, entity: EntityID):
+        for key in self.entity_cells.pop(entity, ()):
+            self.cells[key].remove(entity)
+        self.bounds.pop(entity, None)
+
+    def hits(self, w: World, x: float, y: float) -> List[EntityID]:
+        size = self.cell_size
+        bounds = self.bounds
+        entity_archetype = w.entity_archetype
+        order = {
+            archetype.mask: i
+            for i, archetype in enumerate(w.query_state((Rect,)).matched())
+        }
+        hits = []
+        stale = []
+        for entity in self.cells.get((int(x // size), int(y // size)), ()):
+            archetype = entity_archetype.get(entity)
+            if archetype is None or archetype.mask not in order:
+                stale.append(entity)
+                continue
+            x1, y1, x2, y2 = bounds[entity]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                hits.append(
+                    (order[archetype.mask], archetype.entity_row[entity], entity))
+        # Entries of despawned rects are dropped when a lookup finds them.
+        for entity in stale:
+            self.remove(entity)
+        # Sorted in paint order, so the last hit is the one drawn on top.
+        hits.sort()
+        return [entity for _, _, entity in hits]
+
+
+@dataclass(slots=True)
+class RenderState(Resource):
+    dirty: bool = True
+
+
+def index_rects(w: World):
+    # Only rects whose change tick moved are re-indexed, so code that moves a
+    # rect must re-add it with add_component.
+    changed = w.query(Rect, changed=(Rect,))
+    if not changed:
+        return
+    grid = w.get_resource(SpatialGrid)
+    for entity in changed:
+        rect = w.get_component(entity, Rect)
+        grid.insert(entity, rect.x, rect.y, rect.w, rect.h)
+    w.get_resource(RenderState).dirty = True
+
+
 def find_clicked_entity(w: World):
-    for e in w.get_resource(EventBuffer).read(ClickEvent):
-        for entity in w.query(Rect):
-            rect = w.get_component(entity, Rect)
-            if rect.x <= e.x <= rect.x + rect.w and rect.y <= e.y <= rect.y + rect.h:
-                w.get_resource(EventBuffer).write(ClickEntityEvent(entity))
-                return
+    eb = w.get_resource(EventBuffer)
+    events = eb.read(ClickEvent)
+    if not events:
+        return
+    grid = w.get_resource(SpatialGrid)
+    for e in events:
+        hits = grid.hits(w, e.x, e.y)
+        if hits:
+            eb.write(ClickEntityEvent(hits[-1]))
+            return
 
 
 def add_counter(w: World):
-    for e in w.get_resource(EventBuffer).read(ClickEntityEvent):
-        if w.has_component(e.entity, Counter):
-            counter = w.get_component(e.entity, Counter)
+    events = w.get_resource(EventBuffer).read(ClickEntityEvent)
+    if not events:
+        return
+    try_get_component = w.try_get_component
+    for e in events:
+        counter = try_get_component(e.entity, Counter)
+        if counter is not None:
             counter.value += 1
+            counter.label.setText(str(counter.value))
+            w.get_resource(RenderState).dirty = True
 
 
 class MainWindow(QWindow):
     world: World
     backingStore: QBackingStore
     timer: QTimer
-    schedule: Schedule
+    frame_schedule: Schedule
+    event_schedule: Schedule
+    font: QFont
+    text_pos: QPointF
+    rect_pool: List[QRectF]
+    background_color: QColor
 
     def __init__(self):
         super().__init__()
@@ -81,39 +176,73 @@ class MainWindow(QWindow):
         self.timer.timeout.connect(self.update)
         self.timer.start()
         self.backingStore = QBackingStore(self)
+        self.font = QFont("Arial", 20)
+        self.text_pos = QPointF()
+        self.rect_pool = []
+        self.background_color = QColor(0, 0, 0)
         self.world = World()
         self.world.add_resource(EventBuffer())
-        self.schedule = Schedule()
-        self.schedule.add(find_clicked_entity, add_counter)
+        self.world.add_resource(SpatialGrid())
+        self.world.add_resource(RenderState())
+        self.frame_schedule = Schedule()
+        self.frame_schedule.add(index_rects)
+        self.event_schedule = Schedule()
+        self.event_schedule.add(find_clicked_entity, add_counter)
         self.world.spawn(
             Rect(100, 100, 100, 100, QColor(255, 0, 0)), Counter())
         self.world.spawn(
             Rect(300, 200, 100, 100, QColor(0, 255, 0)), Counter())
 
     def update(self):
-        self.world.get_resource(EventBuffer).update()
-        self.schedule.run(self.world)
+        events = self.world.get_resource(EventBuffer)
+        events.update()
+        self.frame_schedule.run(self.world)
+        if events.has_events():
+            self.event_schedule.run(self.world)
         self.render()
 
     def render(self):
         if not self.isExposed():
             return
+        render_state = self.world.get_resource(RenderState)
+        if not render_state.dirty:
+            return
+        render_state.dirty = False
         background = QRect(0, 0, self.width(), self.height())
         self.backingStore.beginPaint(background)
         device = self.backingStore.paintDevice()
         painter = QPainter(device)
-        painter.fillRect(background, QColor(0, 0, 0))
-        painter.setFont(QFont("Arial", 20))
-        rect_list = self.world.query(Rect)
-        for entity in rect_list:
-            rect = self.world.get_component(entity, Rect)
-            painter.fillRect(
-                QRectF(rect.x, rect.y, rect.w, rect.h), rect.color)
-            if self.world.has_component(entity, Counter):
-                counter = self.world.get_component(entity, Counter)
-                painter.drawText(
-                    QRectF(rect.x, rect.y, rect.w, rect.h), str(counter.value)
-                )
+        painter.fillRect(background, self.background_color)
+        # Consecutive rects of the same color are drawn in one call, so
+        # overlapping rects keep their order.
+        painter.setPen(Qt.PenStyle.NoPen)
+        pool = self.rect_pool
+        start = count = 0
+        run_color: Optional[QColor] = None
+        for _, (rects,) in self.world.query_columns(Rect):
+            for rect in rects:
+                color = rect.color
+                if run_color is None or color != run_color:
+                    if count > start:
+                        painter.drawRects(pool[start:count])
+                    painter.setBrush(color)
+                    run_color = color
+                    start = count
+                if count == len(pool):
+                    pool.append(QRectF())
+                pool[count].setRect(rect.x, rect.y, rect.w, rect.h)
+                count += 1
+        if count > start:
+            painter.drawRects(pool[start:count])
+        # Labels are drawn above every rect, not interleaved with them.
+        painter.setPen(Qt.PenStyle.SolidLine)
+        painter.setFont(self.font)
+        text_pos = self.text_pos
+        for _, (rects, counters) in self.world.query_columns(Rect, Counter):
+            for rect, counter in zip(rects, counters):
+                text_pos.setX(rect.x)
+                text_pos.setY(rect.y)
+                painter.drawStaticText(text_pos, counter.label)
         painter.end()
         self.backingStore.endPaint()
         self.backingStore.flush(background)
@@ -124,8 +253,13 @@ class MainWindow(QWindow):
         self.world.get_resource(EventBuffer).write(ClickEvent(x, y))
         return super().mousePressEvent(e)
 
+    def exposeEvent(self, e: QExposeEvent) -> None:
+        self.world.get_resource(RenderState).dirty = True
+        return super().exposeEvent(e)
+
     def resizeEvent(self, e: QResizeEvent) -> None:
         self.backingStore.resize(e.size())
+        self.world.get_resource(RenderState).dirty = True
         return super().resizeEvent(e)
 
     def closeEvent(self, e: QCloseEvent) -> None:
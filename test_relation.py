@@ -2,18 +2,18 @@ from pyecs import EntityID, World, Schedule, Component
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Edge(Component):
     from_: EntityID
     to: EntityID
 
 
-@dataclass
+@dataclass(slots=True)
 class Person(Component):
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Love(Component):
     pass
 
@@ -26,8 +26,7 @@ bob = w.spawn(Person("Bob"))
 w.spawn(Edge(john, alice), Love())
 w.spawn(Edge(alice, bob), Love())
 
-for edge_id in w.query(Edge, Love):
-    edge = w.get_component(edge_id, Edge)
+for edge, _ in w.query_components(Edge, Love):
     from_p = w.get_component(edge.from_, Person)
     to_p = w.get_component(edge.to, Person)
     print(f"{from_p.name} -love-> {to_p.name}")